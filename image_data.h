@@ -11,8 +11,36 @@ struct ImageData {
     unsigned int originalSize;
     bool isRawPng;
     bool alphaOnly;
+    unsigned char escape; // Runs are { escape, count, value } or { escape, 0, count & 0xFF, count >> 8, value }
+    bool isDelta; // Decompressed bytes are differences to the previous byte (mod 256)
 };
 
+// Decodes a base64 string into a new buffer of size bytes
+inline unsigned char* base64Decode(const char* text, unsigned int size) {
+    unsigned char* data = new unsigned char[size];
+    unsigned int bits = 0;
+    int bitCount = 0;
+    unsigned int n = 0;
+    for (; *text && n < size; ++text) {
+        char c = *text;
+        unsigned int value;
+        if (c >= 'A' && c <= 'Z') value = c - 'A';
+        else if (c >= 'a' && c <= 'z') value = c - 'a' + 26;
+        else if (c >= '0' && c <= '9') value = c - '0' + 52;
+        else if (c == '+') value = 62;
+        else if (c == '/') value = 63;
+        else break; // Padding
+        bits = (bits << 6) | value;
+        bitCount += 6;
+        if (bitCount >= 8) {
+            bitCount -= 8;
+            data[n++] = (unsigned char)(bits >> bitCount);
+            bits &= (1u << bitCount) - 1;
+        }
+    }
+    return data;
+}
+
 std::map<std::string, ImageData> imageMap = {
-{ "gear.png", { new unsigned char[2242] { 137,80,78,71,13,10,26,10,0,0,0,13,73,72,68,82,0,0,0,64,0,0,0,64,8,6,0,0,0,170,105,113,222,0,0,8,137,73,68,65,84,120,156,229,155,79,136,93,245,21,199,191,191,55,51,73,105,104,98,210,64,81,26,72,109,204,63,36,116,136,84,90,80,18,42,109,8,184,146,42,136,46,178,112,33,68,8,41,174,90,186,40,109,87,77,163,110,218,141,46,10,82,219,104,186,144,150,82,16,165,104,69,136,73,13,76,146,98,90,71,16,55,218,138,161,133,78,222,159,79,23,247,156,185,231,253,230,222,251,238,155,121,147,140,157,3,151,251,222,189,191,243,247,119,126,231,156,223,159,43,173,2,0,201,238,95,4,126,1,124,4,12,236,26,5,222,238,35,195,189,37,210,92,243,0,116,236,250,18,112,161,133,194,163,224,109,163,213,1,58,55,91,191,145,0,76,217,253,37,83,96,161,162,119,71,93,222,214,113,95,138,180,39,9,19,117,43,160,147,82,26,0,59,37,253,61,240,88,46,31,236,146,164,175,166,148,230,157,199,10,69,93,132,233,73,17,50,232,72,26,72,154,181,223,125,187,203,126,95,107,73,103,179,164,41,21,134,27,216,239,89,73,243,129,199,68,96,210,6,112,216,103,119,84,40,62,37,233,53,73,223,181,223,253,26,60,127,119,70,210,183,236,183,123,192,62,73,191,155,180,160,173,13,16,2,16,41,37,26,218,37,73,251,227,35,187,95,76,41,125,210,146,215,69,21,6,136,124,246,143,202,4,246,62,73,82,219,97,50,210,0,22,120,6,145,96,8,70,131,204,24,131,148,18,192,94,251,239,238,138,164,203,38,224,180,164,94,131,60,61,73,151,85,42,239,134,223,107,180,135,20,51,154,29,73,74,41,45,122,140,63,183,103,203,131,152,118,128,29,192,30,96,83,214,102,218,174,13,246,127,143,69,111,143,232,125,139,228,247,218,251,218,72,30,50,200,189,134,211,15,116,22,128,61,246,126,131,243,205,240,55,25,255,29,85,58,140,171,188,11,243,32,240,22,240,31,19,232,3,224,57,224,62,96,38,195,217,10,188,97,194,247,130,240,255,4,182,88,155,90,55,166,44,160,182,24,142,227,247,140,230,27,192,214,12,103,198,100,121,206,100,235,155,172,111,1,15,70,93,150,163,252,9,154,97,14,248,41,112,12,248,17,48,111,207,61,151,119,237,254,108,91,65,2,239,103,51,26,78,115,222,120,29,51,222,115,35,100,60,49,150,17,130,0,119,27,129,30,195,189,233,61,210,175,226,22,158,247,237,186,14,220,1,36,90,184,35,69,197,151,12,231,122,198,171,137,103,149,140,238,57,119,183,54,66,48,192,155,193,0,4,194,93,202,177,217,183,255,221,240,60,26,13,224,241,177,122,96,88,134,199,43,232,85,241,140,178,196,106,210,113,222,108,37,67,96,252,112,70,160,10,220,24,189,112,117,51,156,147,70,111,236,122,35,200,242,100,160,215,171,225,217,52,201,114,121,30,110,52,2,230,162,192,23,128,247,131,85,99,32,187,7,248,33,163,199,221,59,192,119,90,89,189,157,17,142,82,76,138,154,96,206,100,187,135,225,0,234,58,188,111,186,117,8,129,56,69,102,41,165,62,240,99,73,223,87,145,143,167,195,253,123,41,165,159,91,219,105,73,223,148,116,68,210,1,73,159,147,212,149,116,73,210,159,36,189,146,82,234,57,205,229,26,32,147,107,74,210,125,146,190,173,162,208,154,145,244,95,73,23,37,253,81,210,95,82,74,61,195,57,41,233,84,133,14,63,73,41,253,96,137,92,148,129,103,39,101,186,243,64,50,48,235,122,238,29,74,125,77,130,175,68,241,229,208,162,72,137,211,38,235,92,166,131,167,199,175,144,7,228,224,106,191,53,119,234,101,247,35,89,187,4,76,25,179,41,202,53,0,255,223,152,235,173,173,227,71,26,163,240,28,167,147,209,88,228,25,100,60,82,163,203,217,33,163,6,132,195,53,8,127,24,167,23,26,20,232,208,34,24,186,130,43,228,229,58,253,190,70,167,195,222,206,93,33,73,58,39,233,107,42,167,176,168,24,59,179,42,106,243,180,156,121,56,89,77,110,70,216,35,233,14,73,91,172,217,167,146,222,149,244,183,48,142,125,14,82,59,241,106,224,233,242,239,86,17,35,166,53,60,181,254,171,164,187,228,243,13,138,170,170,202,82,167,130,48,99,3,195,115,137,59,129,211,192,21,170,211,214,192,222,157,6,238,172,162,49,38,111,247,130,83,53,186,29,243,134,9,56,207,210,10,239,99,96,27,35,198,102,11,1,54,153,82,113,105,204,5,241,98,38,175,55,22,12,103,83,164,53,38,127,143,53,219,76,23,24,174,24,207,3,201,103,121,215,66,47,184,48,15,25,161,86,81,191,70,249,221,198,200,33,175,220,188,152,201,171,57,135,243,192,238,21,24,97,198,238,15,5,163,187,247,93,3,190,220,81,49,38,162,155,37,21,99,227,48,176,49,165,212,29,135,57,197,154,93,31,216,165,98,21,104,86,69,141,128,138,177,24,231,249,83,129,127,202,218,116,13,247,53,96,151,209,108,61,28,40,114,125,23,216,40,233,176,209,204,61,57,137,34,133,204,81,78,94,8,247,63,3,183,57,193,22,76,61,85,125,30,184,24,122,221,189,43,142,253,171,192,43,118,93,13,207,99,59,199,189,104,52,27,83,108,84,222,238,183,153,14,81,39,215,115,142,144,10,159,176,151,113,156,58,243,121,96,191,181,107,236,129,192,248,180,225,94,175,80,234,121,224,27,216,2,138,181,223,0,124,29,248,85,69,123,167,113,186,77,71,184,140,192,126,202,233,121,28,86,174,227,19,139,8,20,185,247,76,104,156,247,192,7,192,173,52,108,78,4,198,123,41,3,91,94,143,63,154,227,228,244,128,71,89,58,15,241,128,185,183,169,35,40,11,164,91,77,230,168,195,32,252,254,53,94,111,80,184,173,95,207,52,244,192,139,77,61,128,21,57,192,83,25,99,119,189,71,236,253,12,153,43,83,14,29,15,90,143,100,184,78,235,169,200,171,66,6,247,192,23,51,217,163,62,207,4,158,41,10,224,61,120,60,235,61,40,51,195,193,42,35,80,150,161,51,148,227,185,31,240,94,240,247,85,130,103,180,220,8,47,4,222,110,136,171,225,125,202,240,92,249,131,153,204,209,139,142,7,79,73,57,227,20,122,241,40,195,41,171,177,7,24,30,119,100,140,1,102,141,105,171,37,49,107,59,27,104,196,224,89,25,143,168,246,192,152,90,143,122,187,37,202,103,132,124,117,247,233,64,200,173,249,250,8,230,15,140,211,107,53,252,163,55,189,103,52,162,55,61,16,121,6,60,239,132,215,131,12,222,113,79,71,221,34,84,5,19,207,183,47,135,54,46,248,118,169,216,116,168,81,102,179,203,163,50,223,207,91,62,238,180,169,235,109,237,191,147,82,234,74,250,71,5,189,205,57,14,16,231,41,219,157,84,208,239,101,211,105,201,218,196,218,223,110,94,101,168,50,192,148,89,243,126,251,239,59,59,146,244,177,180,88,237,85,245,166,111,126,198,29,225,157,192,76,131,215,12,129,247,166,185,248,237,21,244,150,108,176,186,215,68,25,77,102,247,138,251,77,167,250,24,196,218,11,130,119,49,92,15,56,76,62,8,178,54,211,224,111,2,239,213,75,131,172,195,66,40,234,188,94,75,225,51,196,165,55,214,206,100,232,249,138,246,171,62,25,90,223,211,97,138,189,128,127,7,230,238,122,191,164,88,76,104,165,124,69,15,236,2,62,52,186,215,25,14,168,117,91,89,49,112,121,207,127,72,177,184,50,210,3,107,140,176,209,116,201,51,202,53,96,135,87,71,113,181,215,87,78,94,77,41,45,80,228,240,214,187,59,150,195,167,82,74,87,37,29,146,116,65,197,46,78,82,177,202,236,61,56,48,222,206,159,172,205,140,225,30,74,41,93,53,154,173,87,165,109,5,105,38,165,180,32,233,85,149,43,78,17,112,183,93,191,139,162,214,120,45,45,139,255,140,27,184,44,126,51,55,70,110,151,180,205,154,253,75,197,196,231,198,111,140,4,75,173,203,173,177,28,97,253,109,142,218,159,117,187,61,62,45,13,165,174,121,138,138,43,63,32,177,95,210,241,155,124,64,98,90,197,233,209,166,3,18,93,195,57,105,109,242,3,18,167,83,74,239,85,202,21,92,115,82,71,100,124,250,57,169,35,50,239,140,224,185,172,35,50,117,12,39,117,72,234,201,229,26,33,200,114,99,14,73,85,48,94,127,199,228,50,230,147,56,40,217,227,179,118,80,50,51,194,137,26,134,14,255,127,71,101,43,4,89,127,135,165,3,241,245,123,92,62,10,149,247,154,61,171,122,238,107,1,231,130,2,30,152,30,163,24,219,51,12,175,67,198,203,223,61,198,112,192,5,56,87,165,16,101,133,184,100,161,182,77,207,143,172,205,195,36,38,126,50,83,87,220,116,0,36,93,145,116,80,229,58,67,146,180,207,38,54,221,6,118,94,200,236,211,240,186,65,71,210,21,202,175,67,22,39,101,70,211,101,204,63,153,25,89,132,181,62,196,220,118,38,104,155,20,151,226,35,187,31,176,241,219,230,163,169,3,1,215,103,131,151,140,118,35,239,208,190,21,172,214,87,99,151,237,158,84,238,198,28,82,249,45,225,40,240,253,191,104,172,203,53,109,87,4,147,54,128,123,201,5,251,237,61,232,134,216,90,131,87,7,142,59,48,154,145,199,68,96,162,155,163,113,82,37,233,172,209,247,19,98,178,123,155,203,219,118,141,198,89,155,168,141,181,46,120,83,128,114,174,190,157,209,103,252,219,192,219,70,235,179,241,241,180,52,84,208,220,194,26,255,124,254,127,134,253,101,8,165,241,67,76,0,0,0,0,73,69,78,68,174,66,96,130 }, 2242, 64, 64, 4096, true, false } },
+{ "gear.png", { base64Decode("ARcAEI/nAQz/548MAS0AGNcBEP/XGAEsAKsBEv+rASsAGAEU/xgBKgBQART/UAEqAHgBBP+3AQoAtwEE/3gBKgCnAQT/jwEKAI8BBP+nASoAzwEE/2gBCgBoAQT/zwEfABAgAQgAJAEF/zgBCgA4AQX/JAEIACAQARIAVM////OfQAEEAAzHAQT/8wgBCgAI8wEE/8cMAQQAQJ/z///PVAEPAHABB//fg2CA5wEF/5sBDACbAQX/54Bgg98BB/9wAQ0AOPsBEP/3JAEMACT3ARD/+zgBDADHARH/aAEOAGgBEf/HAQsAXAER/3ABEAB0ARH/XAEJAAzjAQT/7zSA3wEH/9tAARIARNcBB//fgDTvAQT/4wwBCACDAQX/dAEDADyHt7+7j0QBFgBEj7u/t4c8AQMAdAEF/4MBBwAg9wEE/9cEASoABNcBBP/3IAEGAKcBBf9IASwASAEF/6sBBQBAAQX/twEuALcBBf9AAQMABM8BBP/7KAEUACRQYGBQJAEUACT7AQT/zwQAAGQBBf+LARIAJI/jAQb/448kARIAiwEF/2QAANMBBP/rEAEQAAyP+wEK//uPDAEQABDrAQT/0wAMAQX/ZAEQACTTAQ7/0yQBEABkAQX/DBABBf+fCAEOACTnARD/5yQBDgAInwEF/wwA3wEF/8cYAQwADNMBB//nv7/nAQf/0wwBDAAYxwEF/98AAHABBv/jKAELAI8BBv+nNAEEADCjAQb/jwELACjjAQb/cAAABK8BBv/nGAEJACT7AQT/+1gBCABY+wEE//skAQkAGOcBBv+rBAEDAASXAQb/qwEJAI8BBf9YAQoAWAEF/48BCQCrAQb/lwQBBgBo+wEF/zABCADjAQT/pwEMAKcBBP/jAQgAMAEF//toAQkARPsBBP+LAQcAJAEF/zABDAAwAQX/JAEHAIsBBP/7RAELAI8BBP/HAQcAUAEE/+cBDgDrAQT/UAEHAMcBBP+PAQwASAEE/98BBwBgAQT/vwEOAL8BBP9gAQcA3wEE/0gBDABIAQT/3wEHAGABBP+/AQ4AvwEE/2ABBwDfAQT/SAEMAI8BBP/HAQcAUAEE/+cBDgDrAQT/UAEHAMcBBP+PAQsARPsBBP+LAQcAJAEF/zABDAA0AQX/JAEHAIsBBP/7RAEJAGj7AQX/MAEIAOMBBP+nAQwApwEE/+MBCAAwAQX/+2gBBgAElwEG/6sBCQCPAQX/WAEKAFgBBf+PAQkAqwEG/5cEAQMABK8BBv/nGAEJACT7AQT/+1gBCABY+wEE//skAQkAGOcBBv+vBAAAcAEG/+MoAQsAjwEG/6c0AQQAMKcBBv+PAQsAKOMBBv9wAADfAQX/xxgBDAAM0wEH/+e/v+cBB//TDAEMABjHAQX/3wAQAQX/nwgBDgAk5wEQ/+ckAQ4ACJ8BBf8MDAEF/2QBEAAk0wEO/9MkARAAZAEF/wwA0wEE/+sQARAADI/7AQr/+48MARAAEOsBBP/TAABkAQX/iwESACSP4wEG/+OLJAESAIsBBf9kAAAEzwEE//soARQAJExgYEwkARQAJPsBBP/PBAEDAEABBf+3AS4AtwEF/0ABBQCnAQX/SAEsAEgBBf+rAQYAIPcBBP/XBAEqAATXAQT/9yABBwCDAQX/dAEDADyHt7+7j0QBFgBEj7u/t4c8AQMAdAEF/4MBCAAM4wEE/+80gN8BB//bRAESAETbAQf/34A07wEE/+MMAQkAXAER/3QBEAB0ARH/XAELAMcBEf9oAQ4AaAER/8cBDAA4+wEQ//ckAQwAJPcBEP/7OAENAHABB//fg2CA5wEF/5sBDACbAQX/54Bgg98BB/9wAQ8AVM////OfQAEEAAzHAQT/8wgBCgAI8wEE/8cMAQQAQJ/z///PVAESABAgAQgAJAEF/zgBCgA4AQX/JAEIACAQAR8AzwEE/2gBCgBoAQT/zwEqAKcBBP+PAQoAjwEE/6cBKgB4AQT/twEKALcBBP94ASoAUAEU/1ABKgAYART/GAErAKsBEv+rASwAFNcBEP/XFAEtAAyP5wEM/+ePDAEXAA==", 1549), 1549, 64, 64, 4096, false, true, 1, false } },
 };
\ No newline at end of file
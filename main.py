@@ -1,15 +1,61 @@
 ALPHA_ONLY = True # Stores only the alpha values of the images
 RESIZE_IMAGES = True # Resizes the images
 RESIZE_SIZE = (64, 64)
+VERIFY_ROUNDTRIP = False # Checks that every compressed image decompresses to its original data
 
-import os, re, time, cProfile, pstats
-from PIL import Image, ImageOps
+HEADER_FILE = "image_data.h"
+MANIFEST_FILE = "image_data.manifest.json" # Hashes of the images in the header, used to skip unchanged images
+
+import os, re, time, json, cProfile, pstats, hashlib, multiprocessing, multiprocessing.pool
+from itertools import starmap
 import io
-from base64 import b64encode
+from base64 import b64encode, b64decode
 
 import cv2
 import numpy as np
 from collections import Counter
+from dataclasses import dataclass, field
+
+try:
+    import numba # Optional, compiles the rle loops to native code
+except ImportError:
+    numba = None
+
+# Maximum length of a single string literal in the header, MSVC rejects literals longer than 16380 characters
+BASE64_LITERAL_LENGTH = 4096
+
+# Decodes the base64 image data of a generated header when the program starts
+BASE64_DECODER = """// Decodes a base64 string into a new buffer of size bytes
+inline unsigned char* base64Decode(const char* text, unsigned int size) {
+    unsigned char* data = new unsigned char[size];
+    unsigned int bits = 0;
+    int bitCount = 0;
+    unsigned int n = 0;
+    for (; *text && n < size; ++text) {
+        char c = *text;
+        unsigned int value;
+        if (c >= 'A' && c <= 'Z') value = c - 'A';
+        else if (c >= 'a' && c <= 'z') value = c - 'a' + 26;
+        else if (c >= '0' && c <= '9') value = c - '0' + 52;
+        else if (c == '+') value = 62;
+        else if (c == '/') value = 63;
+        else break; // Padding
+        bits = (bits << 6) | value;
+        bitCount += 6;
+        if (bitCount >= 8) {
+            bitCount -= 8;
+            data[n++] = (unsigned char)(bits >> bitCount);
+            bits &= (1u << bitCount) - 1;
+        }
+    }
+    return data;
+}
+
+"""
+
+# Matches a single image entry of a generated header, e.g.
+# { "bug.png", { base64Decode("AFwAAAP/", 6), 6, 64, 64, 4096, false, true, 2, false } },
+_ENTRY_RE = re.compile(r'"([^"]+)", \{ base64Decode\(((?:"[A-Za-z0-9+/=]*" ?)+), (\d+)\), (\d+), (\d+), (\d+), (\d+), (\w+), (\w+), (\d+), (\w+) \}')
 
 def profile(func):
     def wrapper(*args, **kwargs):
@@ -44,72 +90,139 @@ def timer(func=None, *, count=1):
     
     return wrapper
 
-def read_image(file_path: str) -> tuple[bytearray, int, int]:
+def read_image(file_path: str) -> tuple[np.ndarray, int, int, bytes]:
     """
-    Reads a image and returns a tuple of (bytes, width, height)
+    Reads a image and returns a tuple of (RGBA bytes, width, height, raw png data)
     """
     with open(file_path, 'rb') as f:
-        img = Image.open(f)
-        width, height = img.size
-        image_data = bytearray(img.tobytes())
-        return (image_data, width, height)
-
-def generate_header(image_data_map: dict):
-    """
-    Generates a image_data.h file that contains all images
-    """
-    header = "#pragma once\n\n"
-    header += "#include <map>\n"
-    header += "#include <string>\n\n"
-    header += "struct ImageData {\n"
-    header += "    unsigned char* data;\n"
-    header += "    unsigned int size;\n"
-    header += "    unsigned int width;\n"
-    header += "    unsigned int height;\n"
-    header += "    unsigned int originalSize;\n"
-    header += "    bool isRawPng;\n"
-    header += "    bool alphaOnly;\n"
-    header += "};\n\n"
-    header += "std::map<std::string, ImageData> imageMap = {\n"
+        raw_png_data = f.read()
 
-    for file_name, (image_data, width, height, original_size, is_raw_png, alpha_only) in image_data_map.items():
-        image_data_str = ','.join(map(str, image_data))
-        data_len = len(image_data)
-        header += f'{{ "{file_name}", {{ new unsigned char[{data_len}] {{ {image_data_str} }}, {data_len}, {width}, {height}, {original_size}, {"true" if is_raw_png else "false"}, {"true" if alpha_only else "false"} }} }},\n'
+    # IMREAD_UNCHANGED keeps the alpha channel, OpenCV decodes to BGR(A) so it is converted to RGBA
+    img = cv2.imdecode(np.frombuffer(raw_png_data, dtype=np.uint8), cv2.IMREAD_UNCHANGED)
+    if img.dtype == np.uint16:
+        img = (img >> 8).astype(np.uint8)
 
-    header += "};"
+    if img.ndim == 2:
+        img = cv2.cvtColor(img, cv2.COLOR_GRAY2RGBA)
+    elif img.shape[2] == 3:
+        img = cv2.cvtColor(img, cv2.COLOR_BGR2RGBA)
+    else:
+        img = cv2.cvtColor(img, cv2.COLOR_BGRA2RGBA)
 
-    return header
+    height, width = img.shape[:2]
+    return (img.reshape(-1), width, height, raw_png_data)
 
-def extract_image_data(header: str):
+@dataclass
+class ImageTable:
+    """
+    All images of a header, stored as one list per field
+    """
+    names: list[str] = field(default_factory=list)
+    datas: list[bytes] = field(default_factory=list)
+    widths: list[int] = field(default_factory=list)
+    heights: list[int] = field(default_factory=list)
+    original_sizes: list[int] = field(default_factory=list)
+    raw_png: list[bool] = field(default_factory=list)
+    alpha_only: list[bool] = field(default_factory=list)
+    escapes: list[int] = field(default_factory=list)
+    delta: list[bool] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def add(self, name: str, data: bytes, width: int, height: int, original_size: int,
+            is_raw_png: bool, alpha_only: bool, escape: int, is_delta: bool) -> None:
+        """
+        Adds an image to the end of the table
+        """
+        self.names.append(name)
+        self.datas.append(data)
+        self.widths.append(width)
+        self.heights.append(height)
+        self.original_sizes.append(original_size)
+        self.raw_png.append(is_raw_png)
+        self.alpha_only.append(alpha_only)
+        self.escapes.append(escape)
+        self.delta.append(is_delta)
+
+    def row(self, i: int) -> tuple:
+        """
+        Returns all fields of the image at index i, in the same order as add takes them
+        """
+        return (self.names[i], self.datas[i], self.widths[i], self.heights[i], self.original_sizes[i],
+                self.raw_png[i], self.alpha_only[i], self.escapes[i], self.delta[i])
+
+def generate_header(image_table: ImageTable, header_file) -> None:
+    """
+    Generates a image_data.h file that contains all images and writes it to header_file
+    """
+    header_file.write("".join([
+        "#pragma once\n\n",
+        "#include <map>\n",
+        "#include <string>\n\n",
+        "struct ImageData {\n",
+        "    unsigned char* data;\n",
+        "    unsigned int size;\n",
+        "    unsigned int width;\n",
+        "    unsigned int height;\n",
+        "    unsigned int originalSize;\n",
+        "    bool isRawPng;\n",
+        "    bool alphaOnly;\n",
+        "    unsigned char escape; // Runs are { escape, count, value } or { escape, 0, count & 0xFF, count >> 8, value }\n",
+        "    bool isDelta; // Decompressed bytes are differences to the previous byte (mod 256)\n",
+        "};\n\n",
+        BASE64_DECODER,
+        "std::map<std::string, ImageData> imageMap = {\n",
+    ]))
+
+    # Each image is written as soon as it is serialized so the whole header is never held in memory
+    bool_str = ("false", "true")
+    data_lens = [len(data) for data in image_table.datas]
+    for i in range(len(image_table)):
+        # Image data is stored as base64, split into adjacent string literals to stay below compiler limits
+        base64_data = b64encode(image_table.datas[i]).decode()
+        image_data_str = '" "'.join(base64_data[j:j + BASE64_LITERAL_LENGTH] for j in range(0, len(base64_data), BASE64_LITERAL_LENGTH))
+        header_file.write(f'{{ "{image_table.names[i]}", {{ base64Decode("{image_data_str}", {data_lens[i]}), {data_lens[i]}, '
+                          f'{image_table.widths[i]}, {image_table.heights[i]}, {image_table.original_sizes[i]}, '
+                          f'{bool_str[image_table.raw_png[i]]}, {bool_str[image_table.alpha_only[i]]}, '
+                          f'{image_table.escapes[i]}, {bool_str[image_table.delta[i]]} }} }},\n')
+
+    header_file.write("};")
+
+def extract_image_data(header: str) -> ImageTable:
     """
     Extracts image data from a header file
     """
-    extracted_image_data_map = {}
-    lines: list[str] = header.split('\n')
-    i = 14
-    while i < len(lines):
-        line = lines[i]
-        #line = "{ \"bug.png\", { new unsigned char[6439] { 0, 92, 0, 0, 3, 255, 1, 0, 4, 0, 0, 3, 255, 101}, 64, 64 } }"
-        pattern = r'\"(.*?)\", \{ new unsigned char\[(\d+)\] \{(.*?)\}, (\d+), (\d+), (\d+), (\d+), (.*?) \}'
-        match = re.search(pattern, line)
-        if match:
-            filename = match.group(1)
-            length = match.group(2)
-            image_data = bytearray(map(int, match.group(3).split(',')))
-            width = int(match.group(4))
-            height = int(match.group(5))
-            original_size = int(match.group(6))
-            is_raw_png = bool(match.group(7))
-            alpha_only = bool(match.group(8))
-            extracted_image_data_map[filename] = (image_data, int(length), width, height, original_size, is_raw_png, alpha_only)
-
-        i += 1
-    return extracted_image_data_map
-
-def resize_images(assets_directory: str, output_size: tuple[int, int] = (128, 128)) -> str:
-    """
-    Resizes all image in a directory to a specific size, return the output directory
+    image_table = ImageTable()
+    for match in _ENTRY_RE.finditer(header):
+        image_table.add(
+            name=match.group(1),
+            data=b64decode(match.group(2).replace('"', '').replace(' ', '')),
+            width=int(match.group(5)),
+            height=int(match.group(6)),
+            original_size=int(match.group(7)),
+            is_raw_png=match.group(8) == "true",
+            alpha_only=match.group(9) == "true",
+            escape=int(match.group(10)),
+            is_delta=match.group(11) == "true",
+        )
+
+    return image_table
+
+def resize_image(file_path: str, output_path: str, output_size: tuple[int, int]) -> None:
+    """
+    Resizes a single image to a specific size and saves it to output_path
+    """
+    # IMREAD_UNCHANGED keeps the alpha channel, INTER_AREA is best suited for downscaling
+    img = cv2.imread(file_path, cv2.IMREAD_UNCHANGED)
+    img_resized = cv2.resize(img, output_size, interpolation=cv2.INTER_AREA)
+    cv2.imwrite(output_path, img_resized)
+
+def resize_images(assets_directory: str, output_size: tuple[int, int] = (128, 128), pool: multiprocessing.pool.Pool = None,
+                  file_names: list[str] = None) -> str:
+    """
+    Resizes all image in a directory, or only file_names if given, to a specific size, return the output directory.
+    The images are resized in parallel if a pool is given
     """
     # Ensure the directory path ends with a slash
     if not assets_directory.endswith('/'):
@@ -119,69 +232,239 @@ def resize_images(assets_directory: str, output_size: tuple[int, int] = (128, 12
     output_directory = assets_directory + 'resized/'
     os.makedirs(output_directory, exist_ok=True)
 
-    # Loop through all files in the directory
-    for filename in os.listdir(assets_directory):
-        if filename.endswith('.png'):
-            # Open the image
-            with Image.open(assets_directory + filename) as img:
-                # Resize the image
-                img_resized = img.resize(output_size, Image.LANCZOS)
-                # Save the resized image
-                img_resized.save(output_directory + filename)
+    # Collect all files in the directory
+    if file_names is None:
+        file_names = [filename for filename in os.listdir(assets_directory) if filename.endswith('.png')]
+    jobs = [(assets_directory + filename, output_directory + filename, output_size) for filename in file_names]
+
+    if pool is not None:
+        pool.starmap(resize_image, jobs)
+    else:
+        list(starmap(resize_image, jobs))
 
     print("Resizing complete.")
     return output_directory
 
-def fix_data_for_rle(data: bytearray) -> None:
+def as_uint8_array(data: bytearray | np.ndarray) -> np.ndarray:
     """
-    Replaces all rle flags with a value close enough so that rle functions correctly and returns a copy
+    Returns data as a uint8 array without copying it
     """
-    copy = data.copy()
-    i = copy.find(2)
-    while i != -1:
-        copy[i] = 1
-        i = copy.find(2, i + 1)
+    if isinstance(data, np.ndarray):
+        return data
+    return np.frombuffer(data, dtype=np.uint8)
 
-    return copy
+def pick_escape(data: bytearray | np.ndarray) -> int:
+    """
+    Picks the least used byte value in data to use as the rle escape byte
+    """
+    hist = np.bincount(as_uint8_array(data), minlength=256)
+    return int(hist.argmin())
 
-def rle_compress(data: bytearray) -> bytearray:
+def _rle_compress_kernel(data: np.ndarray, words: np.ndarray, escape: int, out: np.ndarray) -> int:
     """
-    Compresses a bytearray of data using rle (Run-length encoding)
-    and returns the compressed data
+    Rle compression of data into out, returns the compressed length. words is a uint64 view
+    of data used to scan runs 8 bytes at a time. Compiled with numba when it is available
     """
-    compressed_data = bytearray()
     length = len(data)
+    n = 0
     i = 0
     while i < length:
-        count = 1
-        max_count = min(255, length - i)  # Maximum count value
-        while count < max_count and data[i] == data[i + count]:
-            count += 1
-        if count > 2:
-            compressed_data.extend([2, count, data[i]]) # 2 indicates a run
+        value = data[i]
+        pattern = np.uint64(value) * np.uint64(0x0101010101010101) # value in all 8 bytes
+        end = i + min(65535, length - i)
+        j = i + 1
+        while j < end:
+            # Skip whole words while all 8 of their bytes are part of the run
+            if (j & 7) == 0 and j + 8 <= end and words[j >> 3] == pattern:
+                j += 8
+            elif data[j] == value:
+                j += 1
+            else:
+                break
+        count = j - i
+        if count > 255:
+            out[n] = escape
+            out[n + 1] = 0
+            out[n + 2] = count & 0xFF
+            out[n + 3] = count >> 8
+            out[n + 4] = value
+            n += 5
+        elif count > 2 or value == escape:
+            out[n] = escape
+            out[n + 1] = count
+            out[n + 2] = value
+            n += 3
         else:
-            compressed_data.append(data[i])
+            out[n] = value
+            n += 1
             if count == 2:
-                compressed_data.append(data[i + 1])
+                out[n] = value
+                n += 1
         i += count
-    return compressed_data
+    return n
 
-def rle_decompress(compressed_data: bytearray) -> bytearray:
+def _rle_decompress_kernel(c: np.ndarray, escape: int, out: np.ndarray) -> int:
     """
-    Decompresses a bytearray of rle compressed data and returns the decompressed data
+    Byte by byte rle decompression of c into out, returns the decompressed length.
+    Only the length is computed when out is empty. Compiled with numba when it is available
     """
-    decompressed_data = bytearray()
+    length = len(c)
+    fill = len(out) > 0
+    n = 0
     i = 0
-    while i < len(compressed_data):
-        if compressed_data[i] == 2:  # Indicates a run
-            run_length = compressed_data[i + 1]
-            pixel_value = compressed_data[i + 2]
-            decompressed_data.extend([pixel_value] * run_length)
-            i += 3
+    while i < length:
+        if c[i] == escape:
+            run_length = int(c[i + 1])
+            size = 3
+            if run_length == 0:
+                run_length = int(c[i + 2]) | (int(c[i + 3]) << 8)
+                size = 5
+            if fill:
+                out[n:n + run_length] = c[i + size - 1]
+            n += run_length
+            i += size
         else:
-            decompressed_data.append(compressed_data[i])
+            if fill:
+                out[n] = c[i]
+            n += 1
             i += 1
-    return decompressed_data
+    return n
+
+if numba is not None:
+    _rle_compress_kernel = numba.njit(cache=True, boundscheck=False)(_rle_compress_kernel)
+    _rle_decompress_kernel = numba.njit(cache=True, boundscheck=False)(_rle_decompress_kernel)
+
+# Output buffer of the rle compression kernel, reused across images and grown when needed.
+# A run token is at most 3 times the bytes it replaces
+_SCRATCH = np.empty(3 * RESIZE_SIZE[0] * RESIZE_SIZE[1], dtype=np.uint8)
+
+def get_scratch_buffer(size: int) -> np.ndarray:
+    """
+    Returns the shared scratch buffer, growing it if it is smaller than size
+    """
+    global _SCRATCH
+    if len(_SCRATCH) < size:
+        _SCRATCH = np.empty(size, dtype=np.uint8)
+    return _SCRATCH
+
+def warm_up_rle_kernels() -> None:
+    """
+    Compiles the numba rle kernels so worker processes don't each have to
+    """
+    if numba is not None:
+        # Use the same argument types as real calls, numba compiles a separate version for read-only buffers.
+        # Images are compressed from writable arrays, and decompressed from both fresh bytearrays and header bytes
+        compressed_data = rle_compress(np.zeros(16, dtype=np.uint8), 2)
+        rle_decompress(compressed_data, 2)
+        rle_decompress(bytes(compressed_data), 2)
+
+def rle_compress(data: bytearray | np.ndarray, escape: int) -> bytearray:
+    """
+    Compresses a bytearray of data using rle (Run-length encoding)
+    and returns the compressed data. Runs are stored as [escape, count, value],
+    or as [escape, 0, count low byte, count high byte, value] for runs longer than 255
+    """
+    a = as_uint8_array(data)
+    if numba is not None:
+        a = np.ascontiguousarray(a)
+        out = get_scratch_buffer(3 * len(a))
+        n = _rle_compress_kernel(a, a[:len(a) & ~7].view(np.uint64), escape, out)
+        return bytearray(out[:n])
+
+    if len(a) == 0:
+        return bytearray()
+
+    # Find the end of every run of equal bytes
+    ends = np.r_[np.flatnonzero(a[1:] != a[:-1]), len(a) - 1]
+    lengths = np.diff(np.r_[-1, ends])
+    values = a[ends]
+
+    # Split runs longer than 65535 into chunks of 65535 followed by the remainder
+    full, rest = np.divmod(lengths, 65535)
+    chunks = full + (rest > 0)
+    chunk_values = np.repeat(values, chunks)
+    chunk_lengths = np.full(len(chunk_values), 65535, dtype=np.intp)
+    last = np.cumsum(chunks) - 1
+    chunk_lengths[last[rest > 0]] = rest[rest > 0]
+
+    # Runs longer than 2 are stored as runs, shorter ones as raw values.
+    # The escape byte itself is always stored as a run so it can't be mistaken for one
+    is_wide = chunk_lengths > 255
+    is_run = (chunk_lengths > 2) | (chunk_values == escape)
+    sizes = np.where(is_wide, 5, np.where(is_run, 3, chunk_lengths))
+    offsets = np.cumsum(sizes) - sizes
+
+    out = np.repeat(chunk_values, sizes)
+    out[offsets[is_run]] = escape
+    out[offsets[is_run] + 1] = np.where(is_wide, 0, chunk_lengths)[is_run]
+    out[offsets[is_wide] + 2] = chunk_lengths[is_wide] & 0xFF
+    out[offsets[is_wide] + 3] = chunk_lengths[is_wide] >> 8
+    return bytearray(out.tobytes())
+
+def rle_decompress(compressed_data: bytearray, escape: int) -> bytearray:
+    """
+    Decompresses a bytearray of rle compressed data and returns the decompressed data
+    """
+    c = np.frombuffer(compressed_data, dtype=np.uint8)
+    if numba is not None:
+        out = np.empty(_rle_decompress_kernel(c, escape, np.empty(0, dtype=np.uint8)), dtype=np.uint8)
+        _rle_decompress_kernel(c, escape, out)
+        return bytearray(out.tobytes())
+
+    # Every byte is repeated once, except runs which repeat their value count times
+    # and drop the escape and count bytes
+    lengths = np.ones(len(c), dtype=np.intp)
+    i = compressed_data.find(escape)
+    while i != -1:  # Indicates a run
+        run_length = c[i + 1]
+        size = 3
+        if run_length == 0:  # Indicates a run with a 16 bit count
+            run_length = int(c[i + 2]) | (int(c[i + 3]) << 8)
+            size = 5
+        lengths[i:i + size - 1] = 0
+        lengths[i + size - 1] = run_length
+        i = compressed_data.find(escape, i + size)
+
+    return bytearray(np.repeat(c, lengths).tobytes())
+
+def delta_encode(data: bytearray | np.ndarray) -> np.ndarray:
+    """
+    Replaces every byte with its difference to the previous byte (mod 256),
+    the first byte is kept as is
+    """
+    return np.diff(as_uint8_array(data), prepend=np.uint8(0))
+
+def delta_decode(data: bytearray) -> bytearray:
+    """
+    Reverses delta_encode with a running sum (mod 256)
+    """
+    return bytearray(np.cumsum(as_uint8_array(data), dtype=np.uint8))
+
+def encode_rle(data: bytearray | np.ndarray) -> tuple[bytearray, int, bool]:
+    """
+    Compresses data using rle, delta encoding it first when that compresses better,
+    and returns a tuple of (compressed data, escape, is delta)
+    """
+    escape = pick_escape(data)
+    compressed_data = rle_compress(data, escape)
+
+    # Delta encoding turns gradients into runs, but splits up runs next to edges
+    deltas = delta_encode(data)
+    delta_escape = pick_escape(deltas)
+    delta_compressed_data = rle_compress(deltas, delta_escape)
+
+    if len(delta_compressed_data) < len(compressed_data):
+        return (delta_compressed_data, delta_escape, True)
+    return (compressed_data, escape, False)
+
+def encode_alpha_rle(rgba_data: bytearray) -> tuple[bytearray, int, bool]:
+    """
+    Compresses the alpha values of a RGBA image using rle, with or without delta encoding
+    depending on which is smaller, and returns a tuple of (compressed data, escape, is delta)
+    """
+    # Strided view of the alpha channel, it is only copied when the numba kernel needs contiguous data
+    alpha = np.frombuffer(rgba_data, dtype=np.uint8)[3::4]
+    return encode_rle(alpha)
 
 def generate_bytearray_of_length(val, length):
     return bytearray([val] * length)
@@ -195,42 +478,121 @@ def bytearray_differences(bytearray1: bytearray, bytearray2: bytearray) -> str:
     # Ensure both bytearrays are of the same length
     if len(bytearray1) != len(bytearray2):
         text += "Bytearrays must be of the same length.\n"
-    
-    # Iterate through each byte in the bytearrays
-    num_difs = 0
-    for i in range(len(bytearray1)):
-        # Check if the bytes are different
-        if bytearray1[i] != bytearray2[i]:
-            num_difs += 1
-            # Print the difference along with the index
-            text += f"Difference at index {i}: {hex(bytearray1[i])} != {hex(bytearray2[i])}\n"
-    
-    if num_difs == 0:
-        text = "No differences found!"
-    else:
-        text = f"{num_difs} differences found:\n{text}"
 
-    return text
+    # Compare all bytes at once, only the differences are formatted
+    length = min(len(bytearray1), len(bytearray2))
+    a = as_uint8_array(bytearray1)[:length]
+    b = as_uint8_array(bytearray2)[:length]
+    diff_indices = np.flatnonzero(a != b)
+
+    if diff_indices.size == 0:
+        return "No differences found!"
 
-def get_alpha_values(image_data: bytearray) -> bytearray:
+    text += "".join(f"Difference at index {i}: {hex(x)} != {hex(y)}\n"
+                    for i, x, y in zip(diff_indices.tolist(), a[diff_indices].tolist(), b[diff_indices].tolist()))
+
+    return f"{diff_indices.size} differences found:\n{text}"
+
+def get_alpha_values(image_data: bytearray) -> bytes:
     """
     Converts a bytearray of a RGBA image to a bytearray of alpha values
     """
-    return image_data[3::4]
+    return np.frombuffer(image_data, dtype=np.uint8).reshape(-1, 4)[:, 3].tobytes()
+
+def hash_data(data: bytearray) -> bytes:
+    """
+    Returns a short hash of data, used to compare decompressed data with the original
+    """
+    return hashlib.blake2b(data, digest_size=8).digest()
 
-def alpha_vals_to_image_data(alpha_values: bytearray) -> bytearray:
+def hash_file(file_path: str) -> str:
     """
-    Converts a bytearray of alpha values to a bytearray of a RGBA image
+    Returns a hash of the contents of a file, used to detect changed images
     """
-    image_data = bytearray()
-    for i in alpha_values:
-        image_data.extend([255, 255, 255, i])
+    with open(file_path, 'rb') as f:
+        return hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+
+def load_cached_images(image_hashes: dict[str, str], config: list) -> tuple[ImageTable, bool]:
+    """
+    Returns a tuple of (images of the existing header whose hash and config are unchanged since it was generated,
+    whether the header is up to date with all images)
+    """
+    cached_images = ImageTable()
+    if not os.path.exists(MANIFEST_FILE) or not os.path.exists(HEADER_FILE):
+        return (cached_images, False)
+
+    with open(MANIFEST_FILE) as manifest_file:
+        manifest = json.load(manifest_file)
+    if manifest.get("config") != config:
+        return (cached_images, False)
+
+    with open(HEADER_FILE) as header_file:
+        header_images = extract_image_data(header_file.read())
+
+    manifest_hashes = manifest.get("images", {})
+    for i, name in enumerate(header_images.names):
+        if name in image_hashes and manifest_hashes.get(name) == image_hashes[name]:
+            cached_images.add(*header_images.row(i))
+
+    # Images removed from the assets directory still have to be removed from the header
+    up_to_date = len(cached_images) == len(header_images) == len(image_hashes)
+    return (cached_images, up_to_date)
+
+def process_image(file_path: str) -> tuple[str, tuple, int, bytes]:
+    """
+    Reads and compresses a single image and returns a tuple of
+    (file name, image data entry, original size, hash of the uncompressed data)
+    """
+    image_data, width, height, raw_png_data = read_image(file_path)
+    orig_size = len(image_data)
+
+    digest = None
+    if VERIFY_ROUNDTRIP:
+        digest = hash_data(get_alpha_values(image_data) if ALPHA_ONLY else image_data)
+
+    alpha_only = False
+    if ALPHA_ONLY:
+        alpha_only = True
+        decompressed_size = orig_size // 4
+        image_data, escape, is_delta = encode_alpha_rle(image_data)
+    else:
+        decompressed_size = len(image_data)
+        image_data, escape, is_delta = encode_rle(image_data)
 
-    return image_data
+    is_raw_png = False
+    if (len(raw_png_data) < len(image_data)):
+        image_data = raw_png_data
+        is_raw_png = True
+        alpha_only = False
+        is_delta = False
+
+    entry = (image_data, width, height, decompressed_size, is_raw_png, alpha_only, escape, is_delta)
+    return (os.path.basename(file_path), entry, orig_size, digest)
+
+def verify_image(file_name: str, image_data: bytes, original_size: int, is_raw_png: bool,
+                 escape: int, is_delta: bool, digest: bytes) -> None:
+    """
+    Decompresses a single image and checks that it matches the hash of the original data
+    """
+    # Raw png data is stored as is
+    if is_raw_png:
+        return
+
+    image_data = rle_decompress(image_data, escape)
+
+    if is_delta:
+        image_data = delta_decode(image_data)
+
+    expected_length = original_size
+    if len(image_data) != expected_length:
+        raise ValueError(f"{file_name}: Expected {expected_length} bytes, but got {len(image_data)} bytes.")
+
+    if hash_data(image_data) != digest:
+        raise ValueError(f"{file_name}: Decompressed data does not match the original data.")
 
 def main():
     start = time.time()
-    image_data_map = {}
+    image_table = ImageTable()
 
     bytes_saved = 0
 
@@ -241,77 +603,69 @@ def main():
         print("No assets found!")
         return
 
-    if RESIZE_IMAGES:
-        assets_dir = resize_images(assets_dir, RESIZE_SIZE)
+    # Images that are unchanged since the header was generated are taken from the existing header,
+    # unless every image has to be verified
+    file_names = [file_name for file_name in os.listdir(assets_dir) if file_name.endswith(".png")]
+    image_hashes = {file_name: hash_file(os.path.join(assets_dir, file_name)) for file_name in file_names}
+    config = [ALPHA_ONLY, RESIZE_IMAGES, list(RESIZE_SIZE)]
+    if VERIFY_ROUNDTRIP:
+        cached_images, up_to_date = ImageTable(), False
+    else:
+        cached_images, up_to_date = load_cached_images(image_hashes, config)
 
-    original_size = 0
-    for file_name in os.listdir(assets_dir):
-        if file_name.endswith(".png"):
-            file_path = os.path.join(assets_dir, file_name)
-            image_data, width, height = read_image(file_path)
-            orig_size = len(image_data)
-            saved = 0
+    if up_to_date:
+        print(f"{HEADER_FILE} is up to date.")
+        return
 
-            alpha_only = False
-            if ALPHA_ONLY:
-                alpha_only = True
-                image_data = get_alpha_values(image_data)
+    cached_indices = {name: i for i, name in enumerate(cached_images.names)}
+    changed_file_names = [file_name for file_name in file_names if file_name not in cached_indices]
 
-            adjusted_image_data = fix_data_for_rle(image_data)
-            decompressed_size = len(adjusted_image_data)
-            image_data = rle_compress(adjusted_image_data)
+    # Compile before the pool is created so the workers inherit or load the compiled kernels
+    warm_up_rle_kernels()
 
-            is_raw_png = False
-            with open(file_path, 'rb') as fp:
-                raw_png_data = fp.read()
+    with multiprocessing.Pool(os.cpu_count()) as pool:
+        if RESIZE_IMAGES:
+            assets_dir = resize_images(assets_dir, RESIZE_SIZE, pool, changed_file_names)
 
-                if (len(raw_png_data) < len(image_data)):
-                    image_data = raw_png_data
-                    is_raw_png = True
-                    alpha_only = False
+        file_paths = [os.path.join(assets_dir, file_name) for file_name in changed_file_names]
 
+        # Every image is independent, so they are compressed in parallel
+        original_size = 0
+        processed_images = ImageTable()
+        digests = []
+        for file_name, entry, orig_size, digest in pool.map(process_image, file_paths):
+            saved = orig_size - len(entry[0])
             original_size += orig_size
-            saved += orig_size - len(image_data)
             bytes_saved += saved
             print(f"Image: {file_name}\nSaved {saved:_} bytes!")
 
-            image_data_map[file_name] = (image_data, width, height, decompressed_size, is_raw_png, alpha_only)
-
-    # Generate the header file
-    header = generate_header(image_data_map)
-
-    with open("image_data.h", "w") as header_file:
-        header_file.write(header)
-
-    print(f"Header file generated in {round(time.time() - start, 3)}s")
-    print(f"Compression saved {bytes_saved:_} bytes! ({round((bytes_saved / original_size) * 100, 3)}%)")
-
-    decompressed_dir = os.path.join(assets_dir, "decompressed")
-    os.makedirs(decompressed_dir, exist_ok=True)
-
-    for file_name, file_data in image_data_map.items():
-        file_path = os.path.join(decompressed_dir, file_name)
-        image_data = file_data[0]
-        is_raw_png = file_data[4]
-
-        if not is_raw_png:
-            image_data = rle_decompress(image_data)
-
-            if ALPHA_ONLY:
-                image_data = alpha_vals_to_image_data(image_data)
-
-            width = file_data[1]
-            height = file_data[2]
-
-            expected_length = width * height * 4
-            if len(image_data) != expected_length:
-                raise ValueError(f"Expected {expected_length} bytes, but got {len(image_data)} bytes.")
-
-            image = Image.frombytes('RGBA', (width, height), bytes(image_data))
-            image.save(file_path)
-        else:
-            with open(file_path, 'wb') as fp:
-                fp.write(image_data)
+            processed_images.add(file_name, *entry)
+            digests.append(digest)
+
+        # Keep the images in directory order, whether they were cached or just compressed
+        processed_indices = {name: i for i, name in enumerate(processed_images.names)}
+        for file_name in file_names:
+            if file_name in cached_indices:
+                image_table.add(*cached_images.row(cached_indices[file_name]))
+            else:
+                image_table.add(*processed_images.row(processed_indices[file_name]))
+
+        # Generate the header file
+        with open(HEADER_FILE, "w") as header_file:
+            generate_header(image_table, header_file)
+
+        print(f"Header file generated in {round(time.time() - start, 3)}s")
+        if original_size:
+            print(f"Compression saved {bytes_saved:_} bytes! ({round((bytes_saved / original_size) * 100, 3)}%)")
+
+        if VERIFY_ROUNDTRIP:
+            pool.starmap(verify_image, zip(processed_images.names, processed_images.datas, processed_images.original_sizes,
+                                           processed_images.raw_png, processed_images.escapes, processed_images.delta, digests))
+            print("Verified that all images decompress correctly.")
+
+        # Written last so a header that failed verification is regenerated on the next run
+        with open(MANIFEST_FILE, "w") as manifest_file:
+            json.dump({"config": config, "images": image_hashes}, manifest_file, indent=4)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file